@@ -4,6 +4,7 @@ import matplotlib.pyplot as plt
 import os
 from utils import load_config
 from llama_functions import translate_chart_labels, format_stock_analysis
+import localization
 
 # Load paths from config.yaml
 paths = load_config()
@@ -16,6 +17,7 @@ class StockAnalysis:
         self.stock = yf.Ticker(self.ticker)
         self.company_info = {}
         self.stock_prices = pd.DataFrame()
+        self.currency = "USD"  # trading currency, read from info by get_financial_ratios
 
         # Define output folder for plots
         self.plot_path = os.path.join(paths["price_charts"], f"{self.ticker}_price_chart.png")
@@ -39,13 +41,14 @@ class StockAnalysis:
 
         return self.company_info
 
-    def get_stock_price_series(self, language, period="1y", interval="1d"):
-        """Fetches historical stock prices, saves it as a CSV, and generates a plot."""
+    def get_stock_price_series(self, language, period="1y", interval="1d", plot=True, mode="llm"):
+        """Fetches historical stock prices and, unless plot=False, generates a plot."""
         try:
             self.stock_prices = self.stock.history(period=period, interval=interval)[["Close"]]
             self.stock_prices.index = pd.to_datetime(self.stock_prices.index)
 
-            self.save_stock_price_plot(language)
+            if plot:
+                self.save_stock_price_plot(language, mode)
 
         except Exception as e:
             print(f"⚠️ Error fetching stock data for {self.ticker}: {e}")
@@ -53,18 +56,22 @@ class StockAnalysis:
 
         return self.stock_prices
 
-    def save_stock_price_plot(self, language):
-        """Generates and saves a stock price plot with translated labels."""
+    def save_stock_price_plot(self, language, mode="llm"):
+        """Generates and saves a stock price plot with translated labels (mode="fast" uses the catalogs)."""
         if not self.stock_prices.empty:
             labels = {
                 "title": "Stock Price Over Time",  # Remove ticker for translation
-                "y_axis": "Closing Price (USD)"
+                "y_axis": "Closing Price ({currency})"
             }
 
-            if language != "english":
-                translated_labels = translate_chart_labels(labels, target_language=language)
+            if mode == "fast":
+                translated_labels = localization.translate_chart_labels(labels, language, currency=self.currency)
             else:
-                translated_labels = labels  # No translation needed
+                labels = {key: value.format(currency=self.currency) for key, value in labels.items()}
+                if language != "english":
+                    translated_labels = translate_chart_labels(labels, target_language=language)
+                else:
+                    translated_labels = labels  # No translation needed
 
             translated_title = f"{self.ticker} - {translated_labels['title']}"
 
@@ -87,6 +94,7 @@ class StockAnalysis:
         """Fetches financial ratios (P/E, ROE, etc.)."""
         try:
             info = self.stock.info
+            self.currency = info.get("currency") or "USD"
             financials = {
                 "Market Cap (USD)": info.get("marketCap", "N/A"),
                 "Enterprise Value (USD)": info.get("enterpriseValue", "N/A"),
@@ -109,8 +117,8 @@ class StockAnalysis:
         return financials
 
 
-def analyze_multiple_tickers(tickers, language):
-    """Fetches data for multiple tickers"""
+def analyze_multiple_tickers(tickers, language, plot=True, mode="llm"):
+    """Fetches data for multiple tickers (plot=False skips chart rendering)"""
     results = {}
 
     output_dir = os.path.join(paths["data_processed"])
@@ -119,21 +127,50 @@ def analyze_multiple_tickers(tickers, language):
     for ticker in tickers:
         stock = StockAnalysis(ticker)
         
-        # Gather data
+        # Gather data (ratios before prices: they read the currency the chart is labeled in)
         description = stock.get_company_description()
         financial_ratios = stock.get_financial_ratios()
         plot_path = stock.plot_path  
 
         results[ticker] = {
             "Description": description,
-            "Stock Prices": stock.get_stock_price_series(language),
+            "Stock Prices": stock.get_stock_price_series(language, plot=plot, mode=mode),
             "Financial Ratios": financial_ratios,
             "Plot Path": plot_path,
         }
     
     return results
 
-def generate_stock_analysis_text(ticker, stock_prices, language):
+def compute_price_metrics(stock_prices):
+    """
+    Computes the price points and moving averages the analysis text is built from.
+
+    Args:
+        stock_prices (pd.DataFrame): DataFrame containing historical stock prices 
+                                     with a "Close" column.
+
+    Returns:
+        dict: Metrics (None values where the history is too short), or None without data.
+    """
+    if stock_prices is None or stock_prices.empty:
+        return None
+
+    close = stock_prices["Close"]
+    return {
+        "latest_close": close.iloc[-1],
+        "one_week_ago": close.iloc[-6] if len(stock_prices) > 6 else None,
+        "one_month_ago": close.iloc[-22] if len(stock_prices) > 22 else None,
+        "one_year_ago": close.iloc[-252] if len(stock_prices) > 252 else None,
+        # 52-week high & low
+        "high_52w": close.rolling(window=252, min_periods=1).max().iloc[-1],
+        "low_52w": close.rolling(window=252, min_periods=1).min().iloc[-1],
+        # Moving Averages
+        "ma_5": close.rolling(window=5).mean().iloc[-1],
+        "ma_10": close.rolling(window=10).mean().iloc[-1],
+        "ma_30": close.rolling(window=30).mean().iloc[-1],
+    }
+
+def generate_stock_analysis_text(ticker, stock_prices, language, mode="llm", currency="USD"):
     """
     Generates a conditional text analysis based on stock price movements.
 
@@ -141,61 +178,62 @@ def generate_stock_analysis_text(ticker, stock_prices, language):
         ticker (str): Stock ticker symbol (e.g., "AAPL").
         stock_prices (pd.DataFrame): DataFrame containing historical stock prices 
                                      with a "Close" column.
+        language (str): Target language (a value of LANGUAGE_OPTIONS).
+        mode (str): "llm" to have LLaMA polish and translate the text,
+                    "fast" to fill the message catalogs (no network call).
+        currency (str): Currency code the prices are quoted in (e.g. "BRL" for B3 tickers).
 
     Returns:
         str: Analysis text summarizing key stock price movements.
     """
-    if stock_prices is None or stock_prices.empty:
-        return f"No stock price data available for {ticker}."
+    metrics = compute_price_metrics(stock_prices)
 
-    # extract relevant price points
-    latest_close = stock_prices["Close"].iloc[-1]
-    one_week_ago = stock_prices["Close"].iloc[-6] if len(stock_prices) > 6 else None
-    one_month_ago = stock_prices["Close"].iloc[-22] if len(stock_prices) > 22 else None
-    one_year_ago = stock_prices["Close"].iloc[-252] if len(stock_prices) > 252 else None
+    if mode == "fast":
+        return localization.render_stock_analysis(ticker, metrics, language, currency)
 
-    # 52-week high & low
-    high_52w = stock_prices["Close"].rolling(window=252, min_periods=1).max().iloc[-1]
-    low_52w = stock_prices["Close"].rolling(window=252, min_periods=1).min().iloc[-1]
+    if metrics is None:
+        return f"No stock price data available for {ticker}."
 
-    # Moving Averages
-    ma_5 = stock_prices["Close"].rolling(window=5).mean().iloc[-1]
-    ma_10 = stock_prices["Close"].rolling(window=10).mean().iloc[-1]
-    ma_30 = stock_prices["Close"].rolling(window=30).mean().iloc[-1]
+    latest_close = metrics["latest_close"]
+    one_week_ago = metrics["one_week_ago"]
+    one_month_ago = metrics["one_month_ago"]
+    one_year_ago = metrics["one_year_ago"]
+    high_52w, low_52w = metrics["high_52w"], metrics["low_52w"]
+    ma_5, ma_10, ma_30 = metrics["ma_5"], metrics["ma_10"], metrics["ma_30"]
 
     # Start generating text
-    text = f"{ticker} closed at {latest_close:.2f} USD.\n"
+    text = f"{ticker} closed at {latest_close:.2f} {currency}.\n"
 
     # 52-week high/low comparison
     if latest_close == high_52w:
         text += "This is the highest closing price in the past 52 weeks!\n"
     else:
         diff_high = high_52w - latest_close
-        text += f"This price is {diff_high:.2f} USD below the 52-week high of {high_52w:.2f}.\n"
+        text += f"This price is {diff_high:.2f} {currency} below the 52-week high of {high_52w:.2f}.\n"
 
     if latest_close == low_52w:
         text += "This is the lowest closing price in the past 52 weeks!\n"
     else:
         diff_low = latest_close - low_52w
-        text += f"This price is {diff_low:.2f} USD above the 52-week low of {low_52w:.2f}.\n"
+        text += f"This price is {diff_low:.2f} {currency} above the 52-week low of {low_52w:.2f}.\n"
 
     # Week-over-week comparison
     if one_week_ago:
         week_diff = latest_close - one_week_ago
         direction = "above" if week_diff > 0 else "below"
-        text += f"Today's close was {abs(week_diff):.2f} USD {direction} last week's close of {one_week_ago:.2f}.\n"
+        text += f"Today's close was {abs(week_diff):.2f} {currency} {direction} last week's close of {one_week_ago:.2f}.\n"
 
     # Month-over-month comparison
     if one_month_ago:
         month_diff = latest_close - one_month_ago
         direction = "above" if month_diff > 0 else "below"
-        text += f"Today's close was {abs(month_diff):.2f} USD {direction} the close one month ago ({one_month_ago:.2f}).\n"
+        text += f"Today's close was {abs(month_diff):.2f} {currency} {direction} the close one month ago ({one_month_ago:.2f}).\n"
 
     # Year-over-year comparison
     if one_year_ago:
         year_diff = latest_close - one_year_ago
         direction = "above" if year_diff > 0 else "below"
-        text += f"Today's close was {abs(year_diff):.2f} USD {direction} the close one year ago ({one_year_ago:.2f}).\n"
+        text += f"Today's close was {abs(year_diff):.2f} {currency} {direction} the close one year ago ({one_year_ago:.2f}).\n"
 
     # Moving Average Analysis
     if latest_close > ma_5:
@@ -213,7 +251,7 @@ def generate_stock_analysis_text(ticker, stock_prices, language):
     else:
         text += f"The stock is trading below the 30-day moving average ({ma_30:.2f}).\n"
     
-    return format_stock_analysis(text, language)
+    return format_stock_analysis(text, language, metrics={"ticker": ticker, "currency": currency, **metrics})
 
 
 '''
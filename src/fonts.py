@@ -0,0 +1,180 @@
+import os
+import re
+import pickle
+import hashlib
+import threading
+from fpdf.ttfonts import TTFontFile
+
+# Bump when the layout of the cached metrics dictionary changes
+FONT_CACHE_VERSION = 1
+
+FONT_FAMILY = "Lato"
+FALLBACK_FAMILY = "Arial"
+
+# fpdf style -> TTF file inside paths["fonts"]; fpdf embeds every registered font,
+# so list only the styles the report sets (no bold italic)
+LATO_STYLES = {
+    "": "Lato-Regular.ttf",
+    "B": "Lato-Bold.ttf",
+    "I": "Lato-Italic.ttf",
+}
+
+# In-process caches: the TTF is parsed at most once per process
+_metrics_by_hash = {}
+_hash_by_file = {}
+_lock = threading.Lock()
+
+
+def _file_hash(ttf_path):
+    """Returns the SHA-256 of a font file, memoized on (path, size, mtime)."""
+    stat = os.stat(ttf_path)
+    key = (os.path.abspath(ttf_path), stat.st_size, stat.st_mtime)
+    if key not in _hash_by_file:
+        digest = hashlib.sha256()
+        with open(ttf_path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 16), b""):
+                digest.update(chunk)
+        _hash_by_file[key] = digest.hexdigest()
+    return _hash_by_file[key]
+
+
+def _parse_ttf(ttf_path):
+    """Parses a TTF file into the metrics dictionary fpdf expects for unicode fonts."""
+    ttf = TTFontFile()
+    ttf.getMetrics(ttf_path)
+    desc = {
+        "Ascent": int(round(ttf.ascent, 0)),
+        "Descent": int(round(ttf.descent, 0)),
+        "CapHeight": int(round(ttf.capHeight, 0)),
+        "Flags": ttf.flags,
+        "FontBBox": "[%s %s %s %s]" % tuple(int(round(b, 0)) for b in ttf.bbox),
+        "ItalicAngle": int(ttf.italicAngle),
+        "StemV": int(round(ttf.stemV, 0)),
+        "MissingWidth": int(round(ttf.defaultWidth, 0)),
+    }
+    return {
+        "name": re.sub("[ ()]", "", ttf.fullName),
+        "type": "TTF",
+        "desc": desc,
+        "up": round(ttf.underlinePosition),
+        "ut": round(ttf.underlineThickness),
+        "originalsize": os.stat(ttf_path).st_size,
+        "cw": ttf.charWidths,
+    }
+
+
+def _read_cache(cache_path, font_hash):
+    """Loads a pickled metrics cache, returning None if it is missing, stale or corrupt."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as fh:
+            cached = pickle.load(fh)
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable font cache {cache_path}: {e}")
+        return None
+
+    if (
+        not isinstance(cached, dict)
+        or cached.get("version") != FONT_CACHE_VERSION
+        or cached.get("sha256") != font_hash
+        or not isinstance(cached.get("metrics"), dict)
+        or len(cached["metrics"].get("cw") or []) == 0
+    ):
+        print(f"⚠️ Ignoring stale font cache {cache_path}")
+        return None
+
+    return cached["metrics"]
+
+
+def _write_cache(cache_path, font_hash, metrics):
+    """Writes the metrics cache atomically, so pool workers starting together never interleave writes."""
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as fh:
+            pickle.dump({"version": FONT_CACHE_VERSION, "sha256": font_hash, "metrics": metrics}, fh)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ Could not write font cache {cache_path}: {e}")
+
+
+def load_font_metrics(ttf_path, cache_dir=None):
+    """
+    Returns the metrics of a TTF font, parsing the file only when no valid cache exists.
+
+    Args:
+        ttf_path (str): Path to the TTF file.
+        cache_dir (str): Folder for the on-disk cache (defaults to the font's folder).
+
+    Returns:
+        dict: Font metrics (name, descriptor, character widths, ...).
+    """
+    font_hash = _file_hash(ttf_path)
+
+    with _lock:
+        if font_hash in _metrics_by_hash:
+            return _metrics_by_hash[font_hash]
+
+        cache_dir = cache_dir or os.path.dirname(os.path.abspath(ttf_path))
+        stem = os.path.splitext(os.path.basename(ttf_path))[0]
+        cache_path = os.path.join(cache_dir, f"{stem}.{font_hash[:16]}.metrics.pkl")
+
+        metrics = _read_cache(cache_path, font_hash)
+        if metrics is None:
+            metrics = _parse_ttf(ttf_path)
+            _write_cache(cache_path, font_hash, metrics)
+
+        _metrics_by_hash[font_hash] = metrics
+        return metrics
+
+
+def register_fonts(pdf, fonts_dir, family=FONT_FAMILY, styles=LATO_STYLES):
+    """
+    Registers a unicode TTF family on an FPDF document using the cached metrics.
+
+    This does what FPDF.add_font(..., uni=True) does, minus the TTF parsing and
+    the path-dependent .pkl files. Only the glyphs actually written are embedded,
+    since fpdf subsets TTF fonts when the document is output.
+
+    Args:
+        pdf (FPDF): Document to register the fonts on.
+        fonts_dir (str): Folder containing the TTF files.
+        family (str): Font family name to use with set_font.
+        styles (dict): Mapping of fpdf style ("", "B", "I", "BI") to TTF file name.
+
+    Returns:
+        str: The registered family, or FALLBACK_FAMILY if a font file is missing.
+    """
+    ttf_paths = {style: os.path.abspath(os.path.join(fonts_dir, name)) for style, name in styles.items()}
+    missing = [p for p in ttf_paths.values() if not os.path.exists(p)]
+    if missing:
+        print(f"⚠️ Font files not found, falling back to {FALLBACK_FAMILY}: {missing}")
+        return FALLBACK_FAMILY
+
+    for style, ttf_path in ttf_paths.items():
+        fontkey = family.lower() + style
+        if fontkey in pdf.fonts:
+            continue
+
+        metrics = load_font_metrics(ttf_path)
+
+        # Same subset seed as FPDF.add_font (include digits when {nb} is aliased)
+        subset = list(range(0, 57)) if hasattr(pdf, "str_alias_nb_pages") else list(range(0, 32))
+
+        pdf.fonts[fontkey] = {
+            "i": len(pdf.fonts) + 1,
+            "type": metrics["type"],
+            "name": metrics["name"],
+            "desc": metrics["desc"],
+            "up": metrics["up"],
+            "ut": metrics["ut"],
+            "cw": metrics["cw"],
+            "ttffile": ttf_path,
+            "fontkey": fontkey,
+            "subset": subset,
+            "unifilename": None,
+        }
+        pdf.font_files[fontkey] = {"length1": metrics["originalsize"], "type": "TTF", "ttffile": ttf_path}
+        pdf.font_files[os.path.basename(ttf_path)] = {"type": "TTF"}
+
+    return family
@@ -0,0 +1,274 @@
+import os
+import re
+import time
+import pickle
+import threading
+from datetime import datetime, timedelta
+from fpdf import FPDF
+from PIL import Image
+from utils import load_config
+from analysis import StockAnalysis, generate_stock_analysis_text
+from llama_functions import translate_text, translate_date, current_ledger
+import localization
+
+paths = load_config()
+
+# Bump whenever the content or layout of a fragment changes, so old fragments are ignored
+LAYOUT_VERSION = 2
+
+# Fragments older than this are removed from disk
+MAX_FRAGMENT_AGE_DAYS = 3
+
+# English labels shown on report pages (translated once per language and day);
+# ratios hidden by insert_financial_ratios_table are left out on purpose
+PAGE_LABELS = [
+    "Financial Ratios",
+    "Source: Yahoo Finance",
+    "Price-to-Book (P/B)",
+    "Price-to-Earnings (P/E)",
+    "Forward P/E",
+    "PEG Ratio",
+    "Return on Equity (ROE)",
+    "Debt-to-Equity Ratio",
+    "Profit Margin",
+    "Dividend Yield",
+    "Beta (Volatility)",
+]
+
+
+def current_snapshot():
+    """Market data snapshot id: fragments built on the same day share data."""
+    return datetime.today().strftime("%Y-%m-%d")
+
+
+def next_snapshot():
+    """Snapshot id of the next weekday: after the close, today's data is what tomorrow's first report sees."""
+    day = datetime.today() + timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day.strftime("%Y-%m-%d")
+
+
+class FragmentCache:
+    """Two-level (memory + disk) store of precomputed render fragments."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._snapshot = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._roll_over()
+
+    def key(self, ticker, language, snapshot, mode="llm"):
+        raw = f"{ticker}_{language}_{mode}_{snapshot}_v{LAYOUT_VERSION}"
+        return re.sub(r"[^A-Za-z0-9._-]", "_", raw)
+
+    def file_path(self, key, extension):
+        return os.path.join(self.cache_dir, f"{key}.{extension}")
+
+    def _roll_over(self):
+        """
+        On the first call of each day, evicts earlier snapshots from memory and prunes the disk,
+        so long-running workers don't keep every past day's charts.
+        """
+        today = current_snapshot()
+        with self._lock:
+            if self._snapshot == today:
+                return
+            self._snapshot = today
+            for key in list(self._memory):
+                match = re.search(r"_(\d{4}-\d{2}-\d{2})_v\d+$", key)
+                if match and match.group(1) < today:
+                    del self._memory[key]
+        self.prune()
+
+    def get(self, key):
+        """Returns the cached fragment for key, or None."""
+        self._roll_over()
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+
+        pkl_path = self.file_path(key, "pkl")
+        if not os.path.exists(pkl_path):
+            return None
+        try:
+            with open(pkl_path, "rb") as fh:
+                fragment = pickle.load(fh)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable fragment {pkl_path}: {e}")
+            return None
+
+        chart_path = fragment.get("Chart Path")
+        if chart_path and not os.path.exists(chart_path):
+            return None
+
+        with self._lock:
+            self._memory[key] = fragment
+        return fragment
+
+    def put(self, key, fragment):
+        """Stores a fragment in memory and on disk (atomically, so readers never see half a file)."""
+        self._roll_over()
+        pkl_path = self.file_path(key, "pkl")
+        tmp_path = f"{pkl_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                pickle.dump(fragment, fh)
+            os.replace(tmp_path, pkl_path)
+        except OSError as e:
+            print(f"⚠️ Could not write fragment {pkl_path}: {e}")
+
+        with self._lock:
+            self._memory[key] = fragment
+
+    def prune(self, max_age_days=MAX_FRAGMENT_AGE_DAYS):
+        """Removes fragment files older than max_age_days."""
+        cutoff = time.time() - max_age_days * 86400
+        for name in os.listdir(self.cache_dir):
+            file_path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(file_path) < cutoff:
+                    os.remove(file_path)
+            except OSError:
+                pass
+
+
+fragment_cache = FragmentCache(paths["fragments"])
+
+
+def _fallbacks():
+    """LLM calls that fell back to English so far in the current report (0 outside one)."""
+    ledger = current_ledger()
+    return ledger.fallbacks if ledger is not None else 0
+
+
+def localize(text, language, mode="llm"):
+    """Translates a fixed label, skipping the LLM for English and in fast mode."""
+    if mode == "fast":
+        return localization.translate_label(text, language)
+    return text if language == "english" else translate_text(text, language)
+
+
+def get_page_strings(language, snapshot=None, mode="llm"):
+    """Returns the localized page labels and date for a language (cached per day)."""
+    snapshot = snapshot or current_snapshot()
+    key = fragment_cache.key("_page", language, snapshot, mode)
+
+    strings = fragment_cache.get(key)
+    if strings is None:
+        fallbacks_before = _fallbacks()
+        date = datetime.strptime(snapshot, "%Y-%m-%d")
+        date_en = date.strftime("%B %d, %Y")
+        strings = {label: localize(label, language, mode) for label in PAGE_LABELS}
+        if mode == "fast":
+            strings["Date"] = localization.format_date(date, language)
+        elif language == "english":
+            strings["Date"] = date_en
+        else:
+            strings["Date"] = translate_date(date_en, target_language=language)
+        # an LLM error or exhausted token budget leaves English labels: don't keep them all day
+        if _fallbacks() == fallbacks_before:
+            fragment_cache.put(key, strings)
+
+    return strings
+
+
+def flatten_png(image_path):
+    """
+    Drops the alpha channel matplotlib writes, so fpdf embeds the chart without its slow per-pixel split.
+
+    The flattened image is written next to image_path and renamed over it, so a concurrent
+    reader never opens a truncated PNG.
+    """
+    with Image.open(image_path) as image:
+        if image.mode == "RGB":
+            return
+        rgb = image.convert("RGB")
+    tmp_path = f"{image_path}.{os.getpid()}.{threading.get_ident()}.flat.png"
+    rgb.save(tmp_path, format="PNG")
+    os.replace(tmp_path, image_path)
+
+
+def build_ticker_fragment(ticker, language, snapshot, mode="llm"):
+    """
+    Fetches data, renders the chart and writes the localized analysis for one ticker.
+
+    Returns:
+        tuple: (fragment dict, bool telling whether it is complete enough to cache).
+    """
+    key = fragment_cache.key(ticker, language, snapshot, mode)
+    fallbacks_before = _fallbacks()
+
+    stock = StockAnalysis(ticker)
+    png_path = fragment_cache.file_path(key, "png")
+    # workers building the same key concurrently each render their own file (keeps the .png suffix for fpdf/PIL)
+    stock.plot_path = f"{png_path}.{os.getpid()}.{threading.get_ident()}.tmp.png"
+
+    # ratios first: they read the trading currency the chart and analysis quote prices in
+    financial_ratios = stock.get_financial_ratios()
+    stock_prices = stock.get_stock_price_series(language, mode=mode)
+
+    # format_stock_analysis already writes in the target language, no second translation pass
+    analysis_text = generate_stock_analysis_text(ticker, stock_prices, language, mode, stock.currency)
+
+    chart_path, chart_image = None, None
+    if os.path.exists(stock.plot_path):
+        # flatten the private copy before it is published under the shared name
+        flatten_png(stock.plot_path)
+        # keep fpdf's parsed image so page assembly doesn't re-read the PNG
+        chart_image = FPDF()._parsepng(stock.plot_path)
+        # readers only ever see a complete chart under the shared name
+        os.replace(stock.plot_path, png_path)
+        chart_path = png_path
+
+    fragment = {
+        "Ticker": ticker,
+        "Language": language,
+        "Mode": mode,
+        "Snapshot": snapshot,
+        "Layout Version": LAYOUT_VERSION,
+        "Currency": stock.currency,
+        "Chart Path": chart_path,
+        "Chart Image": chart_image,
+        "Analysis": analysis_text,
+        "Financial Ratios": financial_ratios,
+    }
+
+    # Don't freeze a failed fetch or an untranslated (LLM fallback) text for the rest of the day
+    complete = not stock_prices.empty and bool(financial_ratios) and _fallbacks() == fallbacks_before
+    return fragment, complete
+
+
+def get_report_fragments(tickers, language, snapshot=None, mode="llm"):
+    """
+    Returns {ticker: fragment} for a report, building only the fragments not cached yet.
+
+    Args:
+        tickers (list): Ticker symbols, in report order.
+        language (str): Report language (a value of LANGUAGE_OPTIONS).
+        snapshot (str): Data snapshot id (defaults to today's date).
+        mode (str): "llm" (LLaMA-polished text) or "fast" (message catalogs, no LLM calls).
+
+    Returns:
+        dict: Ticker -> fragment with "Chart Path", "Analysis" and "Financial Ratios".
+    """
+    snapshot = snapshot or current_snapshot()
+    fragments = {}
+
+    for ticker in tickers:
+        ticker = ticker.upper()
+        key = fragment_cache.key(ticker, language, snapshot, mode)
+
+        fragment = fragment_cache.get(key)
+        if fragment is None:
+            fragment, complete = build_ticker_fragment(ticker, language, snapshot, mode)
+            if complete:
+                fragment_cache.put(key, fragment)
+        else:
+            print(f"✅ Using cached fragment for {ticker} in {language}")
+
+        fragments[ticker] = fragment
+
+    return fragments
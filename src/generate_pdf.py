@@ -1,38 +1,37 @@
 import os
+import math
+import numbers
 import pandas as pd
 from fpdf import FPDF
 from datetime import datetime
 from utils import load_config
-from llama_functions import translate_date, format_description, translate_text
-from analysis import analyze_multiple_tickers, generate_stock_analysis_text
+from fonts import register_fonts
+from fragments import get_report_fragments, get_page_strings
+import localization
 
 class CustomPDF(FPDF):
-    def __init__(self, paths, ticker_data, language):
+    def __init__(self, paths, fragments, language, mode="llm"):
         super().__init__()
         self.paths = paths 
         self.language = language
+        self.mode = mode
         print(f"Language: {self.language}")
-        self.ticker_data = ticker_data
+        # {ticker: fragment} from fragments.get_report_fragments; pages only place these
+        self.fragments = fragments
+        self.page_strings = get_page_strings(language, mode=mode)
 
-        #self.add_font("Lato", "", os.path.abspath(os.path.join(self.paths["fonts"], "Lato-Regular.ttf")), uni=True)
-        #self.add_font("Lato", "B", os.path.abspath(os.path.join(self.paths["fonts"], "Lato-Bold.ttf")), uni=True)
-        #self.add_font("Lato", "BL", os.path.abspath(os.path.join(self.paths["fonts"], "Lato-Black.ttf")), uni=True)
-        #self.add_font("Lato", "I", os.path.abspath(os.path.join(self.paths["fonts"], "Lato-Italic.ttf")), uni=True)
+        # Lato with cached metrics; only the glyphs used end up embedded in the PDF
+        self.report_font = register_fonts(self, self.paths["fonts"])
 
         self.set_auto_page_break(auto=True, margin=15) 
 
     def format_date(self):
-        """Generate the date in English and translate it only if necessary."""
-        date_en = datetime.now().strftime("%B %d, %Y") 
-
-        if self.language != "english":
-            return translate_date(date_en, target_language=self.language)
-        
-        return date_en 
+        """Returns today's date in the report language (translated once per day)."""
+        return self.page_strings["Date"]
 
     def header(self):
         """Adds a header with the current date and header image."""
-        self.set_font("Arial", "B", 12)
+        self.set_font(self.report_font, "B", 12)
 
         if os.path.exists(self.paths["header_image"]):
             self.image(self.paths["header_image"], x=0, y=0, w=210)
@@ -44,8 +43,18 @@ class CustomPDF(FPDF):
 
     def generate_report(self):
         """Generates a PDF report comparing tickers in a two-column format."""
+        self.build_report()
+
+        # Save the PDF
+        today_date = datetime.today().strftime("%Y_%m_%d")
+        pdf_filename = os.path.join(self.paths["report"], f"financial_report_{today_date}.pdf")
+        self.output(pdf_filename)
+        print(f"PDF saved at: {pdf_filename}")
+
+    def build_report(self):
+        """Lays out all ticker pages without writing anything to disk."""
         self.add_page()
-        tickers = list(self.ticker_data.keys())
+        tickers = list(self.fragments.keys())
 
         for i in range(0, len(tickers), 2):
             ticker1 = tickers[i]
@@ -65,11 +74,9 @@ class CustomPDF(FPDF):
             if i + 2 < len(tickers):
                 self.add_page()
 
-        # Save the PDF
-        today_date = datetime.today().strftime("%Y_%m_%d")
-        pdf_filename = os.path.join(self.paths["report"], f"financial_report_{today_date}.pdf")
-        self.output(pdf_filename)
-        print(f"PDF saved at: {pdf_filename}")
+    def to_bytes(self):
+        """Returns the built report as PDF bytes (used by the HTTP service)."""
+        return self.output(dest="S").encode("latin-1")
 
 
     def add_column(self, ticker, x_pos, start_y):
@@ -77,87 +84,81 @@ class CustomPDF(FPDF):
         self.set_xy(x_pos, start_y) 
 
         self.set_x(x_pos + 7)
-        self.set_font("Arial", "B", 14)
+        self.set_font(self.report_font, "B", 14)
         self.cell(90, 10, ticker, ln=True, align="C")
         self.ln(5)
 
         self.insert_chart(ticker, x_pos, start_y + 8) 
 
-        self.set_font("Arial", "", 11)
+        self.set_font(self.report_font, "", 11)
         self.set_xy(x_pos + 5, self.get_y() + 5) 
 
-        stock_prices = self.ticker_data[ticker]["Stock Prices"]
-        analysis_text = generate_stock_analysis_text(ticker, stock_prices, self.language)
-        if self.language == 'english':
-            self.multi_cell(90, 6, analysis_text) 
-        else:
-            self.multi_cell(90, 6, translate_text(analysis_text, self.language)) 
+        self.multi_cell(90, 6, self.fragments[ticker]["Analysis"]) 
         self.ln(10) 
 
 
     def insert_chart(self, ticker, x_pos, y_pos):
         """Inserts the stock price chart for a given ticker at a specific x and y position."""
-        images_dir = os.path.join(self.paths["images"], "price_charts")
-        matching_images = [f for f in os.listdir(images_dir) if f.startswith(ticker)]
+        fragment = self.fragments[ticker]
+        image_path = fragment.get("Chart Path")
 
-        if not matching_images:
+        if not image_path or not os.path.exists(image_path):
             self.set_xy(x_pos, y_pos)
             self.cell(90, 10, f"No plot available for {ticker}.", ln=True, align="C")
             return
 
-        image_path = os.path.join(images_dir, matching_images[0])
+        # reuse the PNG already parsed in the fragment (fpdf deletes the data after output, hence the copy)
+        if image_path not in self.images and fragment.get("Chart Image"):
+            self.images[image_path] = dict(fragment["Chart Image"], i=len(self.images) + 1)
 
         # ensure images start at the same Y level
         self.image(image_path, x=x_pos, y=y_pos, w=105, h=65)
         new_y = y_pos + 63 
 
         self.set_xy(x_pos + 5, new_y)  
-        self.set_font("Arial", "I", 9)
-        if self.language == 'english':
-            self.cell(90, 5, "Source: Yahoo Finance", ln=True, align="R")
-        else:
-            self.cell(90, 5, translate_text("Source: Yahoo Finance", self.language), ln=True, align="R")
+        self.set_font(self.report_font, "I", 9)
+        self.cell(90, 5, self.page_strings["Source: Yahoo Finance"], ln=True, align="R")
+
 
+    def format_ratio(self, value):
+        """Ratio value as shown in the table, at Yahoo's precision; fast mode uses the language's separators."""
+        if isinstance(value, numbers.Number) and not isinstance(value, bool):
+            if not math.isfinite(value):
+                return "N/A"
+            if self.mode == "fast":
+                return localization.format_number(value, self.language, decimals=None)
+        return str(value)
 
     def insert_financial_ratios_table(self, ticker1, ticker2):
         """Displays financial ratios in a table format with tickers as columns."""
-        data1 = self.ticker_data[ticker1]["Financial Ratios"]
-        data2 = self.ticker_data[ticker2]["Financial Ratios"] if ticker2 else {}
+        data1 = self.fragments[ticker1]["Financial Ratios"]
+        data2 = self.fragments[ticker2]["Financial Ratios"] if ticker2 else {}
 
         ratio_keys = sorted(set(data1.keys()).union(set(data2.keys())))
 
         self.ln(5)
-        self.set_font("Arial", "B", 12)
-        if self.language == 'english':
-            self.cell(90, 8, "Financial Ratios", border=1, align="C")
-        else:    
-            self.cell(90, 8, translate_text("Financial Ratios", self.language), border=1, align="C")
+        self.set_font(self.report_font, "B", 12)
+        self.cell(90, 8, self.page_strings["Financial Ratios"], border=1, align="C")
         self.cell(50, 8, ticker1, border=1, align="C")
         if ticker2:
             self.cell(50, 8, ticker2, border=1, align="C")
         self.ln()
 
         # insert each financial ratio as a row
-        self.set_font("Arial", "", 10)
+        self.set_font(self.report_font, "", 10)
         for ratio in ratio_keys:
-            if str(data1.get(ratio, "-")) == "N/A" or str(data2.get(ratio, "-")) == "N/A" or str(ratio) == "Market Cap (USD)" or str(ratio) == "Enterprise Value (USD)" or str(ratio) == "52-Week Low" or str(ratio) == "52-Week High":
+            if self.format_ratio(data1.get(ratio, "-")) == "N/A" or self.format_ratio(data2.get(ratio, "-")) == "N/A" or str(ratio) == "Market Cap (USD)" or str(ratio) == "Enterprise Value (USD)" or str(ratio) == "52-Week Low" or str(ratio) == "52-Week High":
                 continue
-            if self.language == "english":
-                self.cell(90, 8, ratio, border=1)
-            else: 
-                self.cell(90, 8, translate_text(ratio, self.language), border=1)
-            self.cell(50, 8, str(data1.get(ratio, "-")), border=1, align="C")
+            self.cell(90, 8, self.page_strings.get(ratio, ratio), border=1)
+            self.cell(50, 8, self.format_ratio(data1.get(ratio, "-")), border=1, align="C")
             if ticker2:
-                self.cell(50, 8, str(data2.get(ratio, "-")), border=1, align="C")
+                self.cell(50, 8, self.format_ratio(data2.get(ratio, "-")), border=1, align="C")
             self.ln()
 
         # add source
         self.ln(3)
-        self.set_font("Arial", "I", 9)
-        if self.language == 'english':
-            self.cell(0, 5, "Source: Yahoo Finance", ln=True, align="R")
-        else:
-            self.cell(0, 5, translate_text("Source: Yahoo Finance", self.language), ln=True, align="R")
+        self.set_font(self.report_font, "I", 9)
+        self.cell(0, 5, self.page_strings["Source: Yahoo Finance"], ln=True, align="R")
 
 
 paths = load_config()
@@ -166,8 +167,8 @@ paths = load_config()
 # example usage
 if __name__ == "__main__":
     tickers = ["AAPL", "AMZN", "AMER3.SA", "LREN3.SA"]  
-    ticker_data = analyze_multiple_tickers(tickers, language='pt') 
+    fragments = get_report_fragments(tickers, language='pt') 
 
-    pdf = CustomPDF(paths, ticker_data, language='pt')
+    pdf = CustomPDF(paths, fragments, language='pt')
     pdf.generate_report()
 '''
\ No newline at end of file
@@ -1,11 +1,217 @@
 from groq import Groq
 import os
+import ast
+import json
+import math
+import time
+import contextvars
+from contextlib import contextmanager
 from utils import load_config
 
 paths = load_config()
+llm_settings = paths["llm"]
 
 client = Groq(api_key=paths["groq"])
 
+MODEL = llm_settings.get("model", "llama-3.3-70b-versatile")
+REPORT_TOKEN_BUDGET = llm_settings.get("report_token_budget")
+
+# Rough token estimate (no tokenizer dependency): conservative for accented languages
+CHARS_PER_TOKEN = 3.5
+# Tokens the chat template adds around each message
+MESSAGE_OVERHEAD = 8
+# Below this, a completion is not worth sending
+MIN_COMPLETION_TOKENS = 16
+
+# Shared instructions, sent once per call as the system message instead of being
+# repeated inside every free-text prompt.
+TRANSLATOR_SYSTEM = (
+    "You are a professional translator. Translate the user's text into the language named "
+    "in the first line, keeping it concise and appropriate. Reply with one single translation "
+    "only: no alternatives, notes, quotes or explanations."
+)
+CHART_LABELS_SYSTEM = (
+    "You are a professional translator. Translate the values of the Python dictionary into the "
+    "language named in the first line, keeping them concise and appropriate for a financial chart. "
+    "Reply with the dictionary only, keys unchanged."
+)
+DATE_SYSTEM = (
+    "You are an expert translator. Translate the date into the language named in the first line, "
+    "using that language's natural date format. Reply with the date only."
+)
+WRITER_SYSTEM = (
+    "You are a professional business writer. Improve and summarize the company description, making it "
+    "objective, well-structured and professional, written in the language named in the first line. "
+    "Reply with the description only."
+)
+ANALYST_SYSTEM = (
+    "You are a professional financial analyst writing for corporate financial reports. From the JSON "
+    "price metrics (latest close, reference closes, 52-week range and moving averages), write an "
+    "objective, data-driven stock analysis in the language named in the first line. At most 2 short "
+    "paragraphs with no blank line between them, no title. Be brief on the weekly and monthly comparisons."
+)
+
+
+class TokenBudgetExceeded(Exception):
+    """Raised when an LLM call would not fit in the current report's token budget."""
+
+
+class CompletionTruncated(Exception):
+    """Raised when a completion hits max_completion_tokens, so a cut-off text never reaches a report."""
+
+
+class TokenLedger:
+    """Records prompt/completion tokens and latency of LLM calls, optionally enforcing a budget."""
+
+    def __init__(self, budget=None):
+        self.budget = budget
+        self.calls = []
+        self.skipped = 0  # calls refused by the budget
+        self.failed = 0   # calls that raised (API errors)
+
+    @property
+    def prompt_tokens(self):
+        return sum(call["prompt_tokens"] for call in self.calls)
+
+    @property
+    def completion_tokens(self):
+        return sum(call["completion_tokens"] for call in self.calls)
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def truncated(self):
+        """Calls cut off by max_completion_tokens."""
+        return sum(call["finish_reason"] == "length" for call in self.calls)
+
+    @property
+    def fallbacks(self):
+        """Calls whose caller fell back to the untranslated text, or got a truncated one."""
+        return self.skipped + self.failed + self.truncated
+
+    def remaining(self):
+        return None if self.budget is None else self.budget - self.total_tokens
+
+    def record(self, task, prompt_tokens, completion_tokens, latency, finish_reason):
+        self.calls.append({
+            "task": task,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "latency": latency,
+            "finish_reason": finish_reason,
+        })
+
+    def summary(self):
+        return {
+            "calls": len(self.calls),
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "latency": round(sum(call["latency"] for call in self.calls), 3),
+            "truncated": self.truncated,
+            "budget": self.budget,
+        }
+
+
+# Ledger of the report being built (if any)
+_report_ledger = contextvars.ContextVar("report_ledger", default=None)
+
+
+def current_ledger():
+    """Returns the ledger of the report being built, or None outside report_budget()."""
+    return _report_ledger.get()
+
+
+@contextmanager
+def report_budget(budget=REPORT_TOKEN_BUDGET):
+    """
+    Accounts (and limits) the LLM tokens spent while building one report.
+
+    Usage:
+        with report_budget() as ledger:
+            ... build fragments and the PDF ...
+        print(ledger.summary())
+    """
+    ledger = TokenLedger(budget)
+    token = _report_ledger.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _report_ledger.reset(token)
+        print(f"🧮 LLM usage for report: {ledger.summary()}")
+
+
+def estimate_tokens(text):
+    """Approximates the number of tokens in a text."""
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def completion_budget(input_tokens, ratio, floor, cap):
+    """Sizes max_completion_tokens from the input size instead of a fixed guess."""
+    return int(min(cap, max(floor, math.ceil(input_tokens * ratio))))
+
+
+def _complete(task, system, user, max_completion_tokens, temperature, floor=MIN_COMPLETION_TOKENS):
+    """
+    Sends one chat completion and records its token usage and latency.
+
+    Args:
+        floor (int): Smallest completion worth sending for this task; with less budget
+                     left the call is skipped rather than sent to come back truncated.
+
+    Raises:
+        TokenBudgetExceeded: If the report budget cannot fit the call
+                             (callers fall back as they do on any API error).
+        CompletionTruncated: If the reply was cut off by max_completion_tokens (same fallback).
+    """
+    prompt_estimate = estimate_tokens(system) + estimate_tokens(user) + 2 * MESSAGE_OVERHEAD
+
+    ledger = _report_ledger.get()
+    remaining = ledger.remaining() if ledger is not None else None
+    if remaining is not None:
+        if remaining - prompt_estimate < max(floor, MIN_COMPLETION_TOKENS):
+            ledger.skipped += 1
+            raise TokenBudgetExceeded(
+                f"{task} needs ~{prompt_estimate} prompt + {floor} completion tokens, {remaining} left in report budget"
+            )
+        max_completion_tokens = min(max_completion_tokens, remaining - prompt_estimate)
+
+    start = time.perf_counter()
+    try:
+        completion = client.chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+            temperature=temperature,
+            max_completion_tokens=max_completion_tokens,
+            top_p=1,
+            stream=False,
+        )
+    except Exception:
+        if ledger is not None:
+            ledger.failed += 1
+        raise
+    latency = time.perf_counter() - start
+
+    content = completion.choices[0].message.content.strip()
+    finish_reason = getattr(completion.choices[0], "finish_reason", None)
+    usage = getattr(completion, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None) or prompt_estimate
+    completion_tokens = getattr(usage, "completion_tokens", None) or estimate_tokens(content)
+
+    if ledger is not None:
+        ledger.record(task, prompt_tokens, completion_tokens, latency, finish_reason)
+
+    if finish_reason == "length":
+        # counted in ledger.fallbacks, so the caller's fragment is not cached either
+        raise CompletionTruncated(f"{task} hit max_completion_tokens={max_completion_tokens}")
+
+    return content
+
+
 def translate_text(text, target_language):
     """
     Translates text into the desired language using LLaMA.
@@ -20,32 +226,23 @@ def translate_text(text, target_language):
     if not text:
         return ""
 
-    prompt = f"""
-    You are a professional translator. Translate the following text into {target_language}, 
-    keeping it concise and appropriate. Never send more than one option of translation. Send only the text translated. Only!:
-
-    {text}
-
-    Send only the translated text, nothing more. No other translating options, just one single translation to the text sended to you.
-    """
+    user = f"{target_language}\n{text}"
 
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.5,  
-            max_completion_tokens=200,  
-            top_p=1,
-            stream=False,
+        translated_text = _complete(
+            "translate_text",
+            TRANSLATOR_SYSTEM,
+            user,
+            max_completion_tokens=completion_budget(estimate_tokens(text), ratio=2, floor=16, cap=1024),
+            temperature=0.5,
+            floor=16,
         )
-        
-        translated_text = completion.choices[0].message.content.strip()
         print(f"target language translate_text: {target_language}")
         return translated_text
 
     except Exception as e:
         print(f"❌ Error contacting LLaMA: {e}")
-        return text  
+        return text
 
 
 def translate_chart_labels(labels_dict, target_language):
@@ -59,29 +256,22 @@ def translate_chart_labels(labels_dict, target_language):
     Returns:
         dict: Translated labels dictionary.
     """
-    prompt = f"""
-    You are a professional translator. Translate the following chart-related terms into {target_language},
-    keeping them concise and appropriate for a financial chart:
-
-    {labels_dict}
-
-    Send only the dictionary translated.
-    """
+    labels = repr(labels_dict)
+    user = f"{target_language}\n{labels}"
 
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
+        translated_text = _complete(
+            "translate_chart_labels",
+            CHART_LABELS_SYSTEM,
+            user,
+            max_completion_tokens=completion_budget(estimate_tokens(labels), ratio=2, floor=32, cap=256),
             temperature=0.7,
-            max_completion_tokens=100,
-            top_p=1,
-            stream=False,
+            floor=32,
         )
-    
-        translated_text = completion.choices[0].message.content.strip()
-    
+
         # Convert response back into a dictionary format
-        translated_labels = eval(translated_text) if "{" in translated_text else {"error": "Invalid response"}
+        start, end = translated_text.find("{"), translated_text.rfind("}")
+        translated_labels = ast.literal_eval(translated_text[start:end + 1]) if start != -1 else {"error": "Invalid response"}
         print(f"target language translate_chart_labels: {target_language}")
         return translated_labels
 
@@ -100,24 +290,17 @@ def translate_date(date_str, target_language):
     Returns:
         str: Translated date in the target language.
     """
-    prompt = f"""
-    You are an expert translator. Translate the following date into {target_language}, maintaining natural date formatting:
-
-    English: {date_str}
-    Translated:
-    """
+    user = f"{target_language}\n{date_str}"
 
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
+        translated_date = _complete(
+            "translate_date",
+            DATE_SYSTEM,
+            user,
+            max_completion_tokens=completion_budget(estimate_tokens(date_str), ratio=3, floor=16, cap=48),
             temperature=0.7,
-            max_completion_tokens=50,
-            top_p=1,
-            stream=False,
+            floor=16,
         )
-
-        translated_date = completion.choices[0].message.content.strip()
         print(f"target language translate_date: {target_language}")
         return translated_date
 
@@ -139,27 +322,18 @@ def format_description(description, target_language):
     if not description:
         return "No description available."
 
-    prompt = f"""
-    You are a professional business writer. Improve and summarize the following company description, 
-    making it objective, well-structured, and professional. Then, translate it into {target_language}:
-
-    Raw Description:
-    {description}
-
-    Objective & Translated Description (Send me only the description itself):
-    """
+    user = f"{target_language}\n{description}"
 
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
+        formatted_description = _complete(
+            "format_description",
+            WRITER_SYSTEM,
+            user,
+            # a summary: shorter than the input, but never cut below a short paragraph
+            max_completion_tokens=completion_budget(estimate_tokens(description), ratio=0.6, floor=96, cap=400),
             temperature=0.7,
-            max_completion_tokens=150,
-            top_p=1,
-            stream=False,
+            floor=96,
         )
-
-        formatted_description = completion.choices[0].message.content.strip()
         print(f"target language format_description: {target_language}")
 
         return formatted_description
@@ -168,13 +342,15 @@ def format_description(description, target_language):
         print(f"❌ Error contacting LLaMA: {e}")
         return description  # Fallback to original description if translation fails
 
-def format_stock_analysis(analysis_text, target_language):
+def format_stock_analysis(analysis_text, target_language, metrics=None):
     """
     Uses LLaMA to clean, refine, and translate the stock analysis text into a professional corporate financial style.
 
     Args:
         analysis_text (str): The raw stock analysis text generated from stock data.
         target_language (str): Target language code (e.g., "pt" for Portuguese).
+        metrics (dict): Optional ticker, currency and price metrics (analysis.compute_price_metrics).
+                        When given, they are sent as compact JSON instead of the raw text.
 
     Returns:
         str: A well-structured, refined financial analysis in the target language.
@@ -182,32 +358,30 @@ def format_stock_analysis(analysis_text, target_language):
     if not analysis_text:
         return "No analysis available."
 
-    prompt = f"""
-    You are a professional financial analyst. Improve and refine the following stock analysis,
-    making it objective, well-structured, and suited for corporate financial reports. Then, translate 
-    it into {target_language}. Ensure the analysis is concise, data-driven, and maintains a 
-    professional tone.
-    The analysis must be objective and with a max of 2 paragraphs. Each paragraph must be short. No space shoud be added between paragraphs.
-    Be more objective in the weekly and monthly comparasions. The text must be short.
-
-    Raw Analysis:
-    {analysis_text}
-
-    Objective & Translated Analysis (Send me only the improved analysis text, with no titles):
-    """
+    if metrics:
+        payload = {}
+        for key, value in metrics.items():
+            if isinstance(value, str):
+                payload[key] = value
+            elif value is not None and not math.isnan(value):
+                payload[key] = round(float(value), 2)
+        data = json.dumps(payload, separators=(",", ":"))
+    else:
+        data = analysis_text
+    user = f"{target_language}\n{data}"
 
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
+        formatted_analysis = _complete(
+            "format_stock_analysis",
+            ANALYST_SYSTEM,
+            user,
+            # ~2 short paragraphs, longer when there are more metrics to comment on
+            max_completion_tokens=completion_budget(estimate_tokens(data), ratio=4, floor=240, cap=480),
             temperature=0.5,
-            max_completion_tokens=200,
-            top_p=1,
-            stream=False,
+            floor=240,
         )
         print(f"target language format_stock_analysis: {target_language}")
-        formatted_analysis = completion.choices[0].message.content.strip()
-        
+
         return formatted_analysis
 
     except Exception as e:
@@ -225,4 +399,4 @@ if __name__ == "__main__":
 
     translated_labels = translate_chart_labels(labels, target_language="pt")
     print(f"📊 Translated Labels: {translated_labels}")
-'''
\ No newline at end of file
+'''
@@ -0,0 +1,190 @@
+# Load test for service.py using local stand-ins for Yahoo Finance and Groq
+# Usage: python loadtest.py --requests 40 --concurrency 4 --workers 4
+import os
+import re
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import statistics
+import urllib.request
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import uvicorn
+
+DEFAULT_TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "ABEV3.SA", "LREN3.SA", "CMIG4.SA", "EMBR3.SA"]
+
+
+class StandInTicker:
+    """Mimics the parts of yfinance.Ticker used by analysis.py, with deterministic data."""
+
+    def __init__(self, ticker, latency=0.0):
+        self.ticker = ticker
+        self.latency = latency
+        self._seed = sum(ord(c) for c in ticker)
+
+    @property
+    def info(self):
+        time.sleep(self.latency)
+        rng = np.random.default_rng(self._seed)
+        return {
+            "longName": f"{self.ticker} Stand-in Corp.",
+            "longBusinessSummary": f"{self.ticker} is a stand-in company used for load testing.",
+            "industry": "Testing",
+            "sector": "Technology",
+            "fullTimeEmployees": int(rng.integers(1_000, 100_000)),
+            "country": "Brazil" if self.ticker.endswith(".SA") else "United States",
+            "website": "https://example.com",
+            "currency": "BRL" if self.ticker.endswith(".SA") else "USD",
+            "marketCap": int(rng.integers(10**9, 10**12)),
+            "priceToBook": round(float(rng.uniform(1, 40)), 2),
+            "trailingPE": round(float(rng.uniform(5, 60)), 2),
+            "forwardPE": round(float(rng.uniform(5, 50)), 2),
+            "returnOnEquity": round(float(rng.uniform(0, 1)), 4),
+            "debtToEquity": round(float(rng.uniform(0, 200)), 2),
+            "profitMargins": round(float(rng.uniform(0, 0.4)), 4),
+            "beta": round(float(rng.uniform(0.5, 2)), 2),
+        }
+
+    def history(self, period="1y", interval="1d"):
+        time.sleep(self.latency)
+        rng = np.random.default_rng(self._seed)
+        index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=260)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, len(index))))
+        return pd.DataFrame({"Close": close}, index=index)
+
+
+class StandInGroq:
+    """Mimics groq.Groq().chat.completions.create with a fixed delay and echo-style replies."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.chat = self
+        self.completions = self
+
+    def create(self, model, messages, **kwargs):
+        time.sleep(self.latency)
+        prompt = messages[-1]["content"]
+        # translate_chart_labels expects a dict literal back
+        labels = re.search(r"\{.*\}", prompt, re.DOTALL) if "dictionary" in messages[0]["content"] else None
+        content = labels.group(0) if labels else prompt.strip().splitlines()[-1]
+        message = type("Message", (), {"content": content})
+        choice = type("Choice", (), {"message": message, "finish_reason": "stop"})
+        usage = type("Usage", (), {
+            "prompt_tokens": sum(len(m["content"]) for m in messages) // 4,
+            "completion_tokens": len(content) // 4 + 1,
+        })
+        return type("Completion", (), {"choices": [choice], "usage": usage})
+
+
+def install_stand_ins(cache_dir, yahoo_latency, llm_latency):
+    """Worker initializer: swaps Yahoo and Groq for the stand-ins and redirects charts and fragments."""
+    import analysis
+    import fragments
+    import llama_functions
+
+    analysis.yf.Ticker = partial(StandInTicker, latency=yahoo_latency)
+    analysis.paths["price_charts"] = cache_dir
+    fragments.fragment_cache = fragments.FragmentCache(cache_dir)
+    llama_functions.client = StandInGroq(latency=llm_latency)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _post(url, payload):
+    """POSTs JSON and returns (latency in seconds, response size in bytes)."""
+    body = json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=300) as response:
+        size = 0
+        while chunk := response.read(64 * 1024):
+            size += len(chunk)
+    return time.perf_counter() - start, size
+
+
+def _summary(name, latencies, elapsed):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))]
+    return (
+        f"{name:<14} n={len(latencies):<4} throughput={len(latencies) / elapsed:6.2f} req/s  "
+        f"p50={statistics.median(latencies) * 1000:7.1f} ms  p95={p95 * 1000:7.1f} ms  "
+        f"max={latencies[-1] * 1000:7.1f} ms"
+    )
+
+
+def run(endpoint, base_url, n_requests, concurrency, tickers_per_report, language, mode, label=None):
+    """Fires n_requests at one endpoint and prints throughput and latency percentiles."""
+    payloads = [
+        {
+            "tickers": [DEFAULT_TICKERS[(i + k) % len(DEFAULT_TICKERS)] for k in range(tickers_per_report)],
+            "language": language,
+            "mode": mode,
+        }
+        for i in range(n_requests)
+    ]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda p: _post(f"{base_url}/{endpoint}", p), payloads))
+    elapsed = time.perf_counter() - start
+
+    print(_summary(label or endpoint, [latency for latency, _ in results], elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the report service with local stand-ins.")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--tickers", type=int, default=2, help="tickers per report")
+    parser.add_argument("--language", default="english")
+    parser.add_argument("--mode", default="llm", choices=["llm", "fast"])
+    parser.add_argument("--yahoo-latency", type=float, default=0.2, help="seconds per stand-in Yahoo call")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds per stand-in Groq call")
+    args = parser.parse_args()
+
+    import usage
+    from service import create_app
+
+    cache_dir = tempfile.mkdtemp(prefix="loadtest_cache_")
+    # keep load-test baskets out of the real usage stats that drive prewarm.py
+    usage.paths["usage_db"] = os.path.join(cache_dir, "usage.sqlite3")
+    app = create_app(
+        workers=args.workers,
+        initializer=partial(install_stand_ins, cache_dir, args.yahoo_latency, args.llm_latency),
+    )
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}"
+    print(
+        f"workers={args.workers} concurrency={args.concurrency} tickers/report={args.tickers} "
+        f"language={args.language} mode={args.mode} yahoo_latency={args.yahoo_latency}s llm_latency={args.llm_latency}s"
+    )
+    try:
+        common = (base_url, args.requests, args.concurrency, args.tickers, args.language, args.mode)
+        run("metrics", *common)
+        run("report", *common, "report (cold)")
+        # same baskets again: every ticker fragment is now cached
+        run("report", *common, "report (warm)")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+# Message catalogs for the "fast" localization mode: every string a report needs,
+# filled directly from the computed metrics, so no LLM call is made.
+# Keys of CATALOGS are the values of utils.LANGUAGE_OPTIONS.
+import math
+
+CATALOGS = {
+    "english": {
+        "decimal": ".",
+        "group": ",",
+        "months": ["January", "February", "March", "April", "May", "June", "July",
+                   "August", "September", "October", "November", "December"],
+        "date": "{month} {day}, {year}",
+        "labels": {
+            "Stock Price Over Time": "Stock Price Over Time",
+            "Closing Price ({currency})": "Closing Price ({currency})",
+            "Financial Ratios": "Financial Ratios",
+            "Source: Yahoo Finance": "Source: Yahoo Finance",
+            "Price-to-Book (P/B)": "Price-to-Book (P/B)",
+            "Price-to-Earnings (P/E)": "Price-to-Earnings (P/E)",
+            "Forward P/E": "Forward P/E",
+            "PEG Ratio": "PEG Ratio",
+            "Return on Equity (ROE)": "Return on Equity (ROE)",
+            "Debt-to-Equity Ratio": "Debt-to-Equity Ratio",
+            "Profit Margin": "Profit Margin",
+            "Dividend Yield": "Dividend Yield",
+            "Beta (Volatility)": "Beta (Volatility)",
+        },
+        "messages": {
+            "no_data": "No stock price data available for {ticker}.",
+            "closed": "{ticker} closed at {price}.",
+            "at_high": "This is the highest closing price in the past 52 weeks.",
+            "below_high": "This price is {diff} below the 52-week high of {high}.",
+            "at_low": "This is the lowest closing price in the past 52 weeks.",
+            "above_low": "This price is {diff} above the 52-week low of {low}.",
+            "week_above": "Today's close was {diff} above last week's close of {ref}.",
+            "week_below": "Today's close was {diff} below last week's close of {ref}.",
+            "month_above": "Today's close was {diff} above the close one month ago ({ref}).",
+            "month_below": "Today's close was {diff} below the close one month ago ({ref}).",
+            "year_above": "Today's close was {diff} above the close one year ago ({ref}).",
+            "year_below": "Today's close was {diff} below the close one year ago ({ref}).",
+            "ma5_above": "The stock is currently trading above its 5-day moving average ({ma}).",
+            "ma5_below": "The stock is below its 5-day moving average ({ma}).",
+            "ma10_above": "It is also above the 10-day moving average ({ma}).",
+            "ma10_below": "It is below the 10-day moving average ({ma}).",
+            "ma30_above": "The stock remains above the 30-day moving average ({ma}).",
+            "ma30_below": "The stock is trading below the 30-day moving average ({ma}).",
+        },
+    },
+    "pt": {
+        "decimal": ",",
+        "group": ".",
+        "months": ["janeiro", "fevereiro", "março", "abril", "maio", "junho", "julho",
+                   "agosto", "setembro", "outubro", "novembro", "dezembro"],
+        "date": "{day} de {month} de {year}",
+        "labels": {
+            "Stock Price Over Time": "Preço da Ação ao Longo do Tempo",
+            "Closing Price ({currency})": "Preço de Fechamento ({currency})",
+            "Financial Ratios": "Indicadores Financeiros",
+            "Source: Yahoo Finance": "Fonte: Yahoo Finance",
+            "Price-to-Book (P/B)": "Preço/Valor Patrimonial (P/VP)",
+            "Price-to-Earnings (P/E)": "Preço/Lucro (P/L)",
+            "Forward P/E": "P/L Projetado",
+            "PEG Ratio": "Índice PEG",
+            "Return on Equity (ROE)": "Retorno sobre o Patrimônio (ROE)",
+            "Debt-to-Equity Ratio": "Dívida/Patrimônio Líquido",
+            "Profit Margin": "Margem de Lucro",
+            "Dividend Yield": "Dividend Yield",
+            "Beta (Volatility)": "Beta (Volatilidade)",
+        },
+        "messages": {
+            "no_data": "Não há dados de preço disponíveis para {ticker}.",
+            "closed": "{ticker} fechou a {price}.",
+            "at_high": "É o maior preço de fechamento das últimas 52 semanas.",
+            "below_high": "O preço está {diff} abaixo da máxima de 52 semanas, de {high}.",
+            "at_low": "É o menor preço de fechamento das últimas 52 semanas.",
+            "above_low": "O preço está {diff} acima da mínima de 52 semanas, de {low}.",
+            "week_above": "O fechamento de hoje ficou {diff} acima do da semana passada ({ref}).",
+            "week_below": "O fechamento de hoje ficou {diff} abaixo do da semana passada ({ref}).",
+            "month_above": "O fechamento de hoje ficou {diff} acima do de um mês atrás ({ref}).",
+            "month_below": "O fechamento de hoje ficou {diff} abaixo do de um mês atrás ({ref}).",
+            "year_above": "O fechamento de hoje ficou {diff} acima do de um ano atrás ({ref}).",
+            "year_below": "O fechamento de hoje ficou {diff} abaixo do de um ano atrás ({ref}).",
+            "ma5_above": "A ação negocia acima da média móvel de 5 dias ({ma}).",
+            "ma5_below": "A ação está abaixo da média móvel de 5 dias ({ma}).",
+            "ma10_above": "Também está acima da média móvel de 10 dias ({ma}).",
+            "ma10_below": "Está abaixo da média móvel de 10 dias ({ma}).",
+            "ma30_above": "A ação permanece acima da média móvel de 30 dias ({ma}).",
+            "ma30_below": "A ação negocia abaixo da média móvel de 30 dias ({ma}).",
+        },
+    },
+    "spanish": {
+        "decimal": ",",
+        "group": ".",
+        "months": ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio",
+                   "agosto", "septiembre", "octubre", "noviembre", "diciembre"],
+        "date": "{day} de {month} de {year}",
+        "labels": {
+            "Stock Price Over Time": "Precio de la Acción a lo Largo del Tiempo",
+            "Closing Price ({currency})": "Precio de Cierre ({currency})",
+            "Financial Ratios": "Ratios Financieros",
+            "Source: Yahoo Finance": "Fuente: Yahoo Finance",
+            "Price-to-Book (P/B)": "Precio/Valor Contable (P/VC)",
+            "Price-to-Earnings (P/E)": "Precio/Beneficio (PER)",
+            "Forward P/E": "PER Estimado",
+            "PEG Ratio": "Ratio PEG",
+            "Return on Equity (ROE)": "Rentabilidad sobre Patrimonio (ROE)",
+            "Debt-to-Equity Ratio": "Ratio Deuda/Patrimonio",
+            "Profit Margin": "Margen de Beneficio",
+            "Dividend Yield": "Rentabilidad por Dividendo",
+            "Beta (Volatility)": "Beta (Volatilidad)",
+        },
+        "messages": {
+            "no_data": "No hay datos de precios disponibles para {ticker}.",
+            "closed": "{ticker} cerró a {price}.",
+            "at_high": "Es el precio de cierre más alto de las últimas 52 semanas.",
+            "below_high": "El precio está {diff} por debajo del máximo de 52 semanas de {high}.",
+            "at_low": "Es el precio de cierre más bajo de las últimas 52 semanas.",
+            "above_low": "El precio está {diff} por encima del mínimo de 52 semanas de {low}.",
+            "week_above": "El cierre de hoy fue {diff} superior al de la semana pasada ({ref}).",
+            "week_below": "El cierre de hoy fue {diff} inferior al de la semana pasada ({ref}).",
+            "month_above": "El cierre de hoy fue {diff} superior al de hace un mes ({ref}).",
+            "month_below": "El cierre de hoy fue {diff} inferior al de hace un mes ({ref}).",
+            "year_above": "El cierre de hoy fue {diff} superior al de hace un año ({ref}).",
+            "year_below": "El cierre de hoy fue {diff} inferior al de hace un año ({ref}).",
+            "ma5_above": "La acción cotiza por encima de su media móvil de 5 días ({ma}).",
+            "ma5_below": "La acción está por debajo de su media móvil de 5 días ({ma}).",
+            "ma10_above": "También está por encima de la media móvil de 10 días ({ma}).",
+            "ma10_below": "Está por debajo de la media móvil de 10 días ({ma}).",
+            "ma30_above": "La acción se mantiene por encima de la media móvil de 30 días ({ma}).",
+            "ma30_below": "La acción cotiza por debajo de la media móvil de 30 días ({ma}).",
+        },
+    },
+    "french": {
+        "decimal": ",",
+        "group": "\u00a0",  # non-breaking space
+        "months": ["janvier", "février", "mars", "avril", "mai", "juin", "juillet",
+                   "août", "septembre", "octobre", "novembre", "décembre"],
+        "date": "{day} {month} {year}",
+        "labels": {
+            "Stock Price Over Time": "Évolution du Cours de l'Action",
+            "Closing Price ({currency})": "Cours de Clôture ({currency})",
+            "Financial Ratios": "Ratios Financiers",
+            "Source: Yahoo Finance": "Source : Yahoo Finance",
+            "Price-to-Book (P/B)": "Cours/Valeur Comptable (P/B)",
+            "Price-to-Earnings (P/E)": "Cours/Bénéfice (PER)",
+            "Forward P/E": "PER Prévisionnel",
+            "PEG Ratio": "Ratio PEG",
+            "Return on Equity (ROE)": "Rentabilité des Capitaux Propres (ROE)",
+            "Debt-to-Equity Ratio": "Ratio Dette/Capitaux Propres",
+            "Profit Margin": "Marge Bénéficiaire",
+            "Dividend Yield": "Rendement du Dividende",
+            "Beta (Volatility)": "Bêta (Volatilité)",
+        },
+        "messages": {
+            "no_data": "Aucune donnée de cours disponible pour {ticker}.",
+            "closed": "{ticker} a clôturé à {price}.",
+            "at_high": "C'est le cours de clôture le plus élevé des 52 dernières semaines.",
+            "below_high": "Ce cours est inférieur de {diff} au plus haut sur 52 semaines ({high}).",
+            "at_low": "C'est le cours de clôture le plus bas des 52 dernières semaines.",
+            "above_low": "Ce cours est supérieur de {diff} au plus bas sur 52 semaines ({low}).",
+            "week_above": "La clôture du jour est supérieure de {diff} à celle de la semaine dernière ({ref}).",
+            "week_below": "La clôture du jour est inférieure de {diff} à celle de la semaine dernière ({ref}).",
+            "month_above": "La clôture du jour est supérieure de {diff} à celle d'il y a un mois ({ref}).",
+            "month_below": "La clôture du jour est inférieure de {diff} à celle d'il y a un mois ({ref}).",
+            "year_above": "La clôture du jour est supérieure de {diff} à celle d'il y a un an ({ref}).",
+            "year_below": "La clôture du jour est inférieure de {diff} à celle d'il y a un an ({ref}).",
+            "ma5_above": "L'action se négocie au-dessus de sa moyenne mobile à 5 jours ({ma}).",
+            "ma5_below": "L'action est sous sa moyenne mobile à 5 jours ({ma}).",
+            "ma10_above": "Elle est aussi au-dessus de la moyenne mobile à 10 jours ({ma}).",
+            "ma10_below": "Elle est sous la moyenne mobile à 10 jours ({ma}).",
+            "ma30_above": "L'action reste au-dessus de la moyenne mobile à 30 jours ({ma}).",
+            "ma30_below": "L'action se négocie sous la moyenne mobile à 30 jours ({ma}).",
+        },
+    },
+    "de": {
+        "decimal": ",",
+        "group": ".",
+        "months": ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli",
+                   "August", "September", "Oktober", "November", "Dezember"],
+        "date": "{day}. {month} {year}",
+        "labels": {
+            "Stock Price Over Time": "Aktienkurs im Zeitverlauf",
+            "Closing Price ({currency})": "Schlusskurs ({currency})",
+            "Financial Ratios": "Finanzkennzahlen",
+            "Source: Yahoo Finance": "Quelle: Yahoo Finance",
+            "Price-to-Book (P/B)": "Kurs-Buchwert-Verhältnis (KBV)",
+            "Price-to-Earnings (P/E)": "Kurs-Gewinn-Verhältnis (KGV)",
+            "Forward P/E": "Erwartetes KGV",
+            "PEG Ratio": "PEG-Verhältnis",
+            "Return on Equity (ROE)": "Eigenkapitalrendite (ROE)",
+            "Debt-to-Equity Ratio": "Verschuldungsgrad",
+            "Profit Margin": "Gewinnmarge",
+            "Dividend Yield": "Dividendenrendite",
+            "Beta (Volatility)": "Beta (Volatilität)",
+        },
+        "messages": {
+            "no_data": "Für {ticker} sind keine Kursdaten verfügbar.",
+            "closed": "{ticker} schloss bei {price}.",
+            "at_high": "Das ist der höchste Schlusskurs der letzten 52 Wochen.",
+            "below_high": "Der Kurs liegt {diff} unter dem 52-Wochen-Hoch von {high}.",
+            "at_low": "Das ist der niedrigste Schlusskurs der letzten 52 Wochen.",
+            "above_low": "Der Kurs liegt {diff} über dem 52-Wochen-Tief von {low}.",
+            "week_above": "Der heutige Schlusskurs lag {diff} über dem der Vorwoche ({ref}).",
+            "week_below": "Der heutige Schlusskurs lag {diff} unter dem der Vorwoche ({ref}).",
+            "month_above": "Der heutige Schlusskurs lag {diff} über dem von vor einem Monat ({ref}).",
+            "month_below": "Der heutige Schlusskurs lag {diff} unter dem von vor einem Monat ({ref}).",
+            "year_above": "Der heutige Schlusskurs lag {diff} über dem von vor einem Jahr ({ref}).",
+            "year_below": "Der heutige Schlusskurs lag {diff} unter dem von vor einem Jahr ({ref}).",
+            "ma5_above": "Die Aktie notiert über ihrem gleitenden 5-Tage-Durchschnitt ({ma}).",
+            "ma5_below": "Die Aktie liegt unter ihrem gleitenden 5-Tage-Durchschnitt ({ma}).",
+            "ma10_above": "Sie liegt auch über dem gleitenden 10-Tage-Durchschnitt ({ma}).",
+            "ma10_below": "Sie liegt unter dem gleitenden 10-Tage-Durchschnitt ({ma}).",
+            "ma30_above": "Die Aktie bleibt über dem gleitenden 30-Tage-Durchschnitt ({ma}).",
+            "ma30_below": "Die Aktie notiert unter dem gleitenden 30-Tage-Durchschnitt ({ma}).",
+        },
+    },
+    "italian": {
+        "decimal": ",",
+        "group": ".",
+        "months": ["gennaio", "febbraio", "marzo", "aprile", "maggio", "giugno", "luglio",
+                   "agosto", "settembre", "ottobre", "novembre", "dicembre"],
+        "date": "{day} {month} {year}",
+        "labels": {
+            "Stock Price Over Time": "Andamento del Prezzo dell'Azione",
+            "Closing Price ({currency})": "Prezzo di Chiusura ({currency})",
+            "Financial Ratios": "Indici Finanziari",
+            "Source: Yahoo Finance": "Fonte: Yahoo Finance",
+            "Price-to-Book (P/B)": "Prezzo/Valore Contabile (P/BV)",
+            "Price-to-Earnings (P/E)": "Prezzo/Utili (P/E)",
+            "Forward P/E": "P/E Prospettico",
+            "PEG Ratio": "Rapporto PEG",
+            "Return on Equity (ROE)": "Rendimento del Capitale Proprio (ROE)",
+            "Debt-to-Equity Ratio": "Rapporto Debito/Patrimonio",
+            "Profit Margin": "Margine di Profitto",
+            "Dividend Yield": "Rendimento da Dividendi",
+            "Beta (Volatility)": "Beta (Volatilità)",
+        },
+        "messages": {
+            "no_data": "Nessun dato di prezzo disponibile per {ticker}.",
+            "closed": "{ticker} ha chiuso a {price}.",
+            "at_high": "È il prezzo di chiusura più alto delle ultime 52 settimane.",
+            "below_high": "Il prezzo è {diff} sotto il massimo a 52 settimane di {high}.",
+            "at_low": "È il prezzo di chiusura più basso delle ultime 52 settimane.",
+            "above_low": "Il prezzo è {diff} sopra il minimo a 52 settimane di {low}.",
+            "week_above": "La chiusura di oggi è stata {diff} sopra quella della settimana scorsa ({ref}).",
+            "week_below": "La chiusura di oggi è stata {diff} sotto quella della settimana scorsa ({ref}).",
+            "month_above": "La chiusura di oggi è stata {diff} sopra quella di un mese fa ({ref}).",
+            "month_below": "La chiusura di oggi è stata {diff} sotto quella di un mese fa ({ref}).",
+            "year_above": "La chiusura di oggi è stata {diff} sopra quella di un anno fa ({ref}).",
+            "year_below": "La chiusura di oggi è stata {diff} sotto quella di un anno fa ({ref}).",
+            "ma5_above": "Il titolo scambia sopra la media mobile a 5 giorni ({ma}).",
+            "ma5_below": "Il titolo è sotto la media mobile a 5 giorni ({ma}).",
+            "ma10_above": "È anche sopra la media mobile a 10 giorni ({ma}).",
+            "ma10_below": "È sotto la media mobile a 10 giorni ({ma}).",
+            "ma30_above": "Il titolo resta sopra la media mobile a 30 giorni ({ma}).",
+            "ma30_below": "Il titolo scambia sotto la media mobile a 30 giorni ({ma}).",
+        },
+    },
+}
+
+
+def get_catalog(language):
+    """Returns the catalog for a language, falling back to English for unknown languages."""
+    return CATALOGS.get(language, CATALOGS["english"])
+
+
+def format_number(value, language, decimals=2):
+    """
+    Formats a number with the language's decimal and thousands separators.
+
+    decimals=None keeps the value's own precision (e.g. 0.0045 stays 0,0045 in Portuguese).
+    NaN and infinities, which yfinance sometimes returns, are shown as "N/A".
+    """
+    if not math.isfinite(value):
+        return "N/A"
+    catalog = get_catalog(language)
+    text = f"{value:,}" if decimals is None else f"{value:,.{decimals}f}"
+    return text.replace(",", "\0").replace(".", catalog["decimal"]).replace("\0", catalog["group"])
+
+
+def format_currency(value, language, currency="USD"):
+    """Formats an amount as '<number> <currency code>' (e.g. '1.234,56 USD' in Portuguese)."""
+    return f"{format_number(value, language)} {currency}"
+
+
+def format_date(date, language):
+    """Formats a date in the language's long form (e.g. '24 de março de 2025')."""
+    catalog = get_catalog(language)
+    return catalog["date"].format(day=date.day, month=catalog["months"][date.month - 1], year=date.year)
+
+
+def translate_label(label, language):
+    """Returns the catalog translation of a fixed report label (the label itself if unknown)."""
+    return get_catalog(language)["labels"].get(label, label)
+
+
+def translate_chart_labels(labels_dict, language, **fields):
+    """
+    Catalog equivalent of llama_functions.translate_chart_labels.
+
+    Labels may hold placeholders (e.g. "Closing Price ({currency})"), filled from fields after translation.
+    """
+    return {key: translate_label(value, language).format(**fields) for key, value in labels_dict.items()}
+
+
+def render_stock_analysis(ticker, metrics, language, currency="USD"):
+    """
+    Fills the language's message catalog with the metrics from analysis.compute_price_metrics.
+
+    Args:
+        ticker (str): Stock ticker symbol.
+        metrics (dict): Price metrics, or None when there is no price data.
+        language (str): Target language (a value of LANGUAGE_OPTIONS).
+        currency (str): Currency code shown next to prices.
+
+    Returns:
+        str: The localized analysis text.
+    """
+    messages = get_catalog(language)["messages"]
+    if not metrics:
+        return messages["no_data"].format(ticker=ticker)
+
+    def money(value):
+        return format_currency(value, language, currency)
+
+    latest = metrics["latest_close"]
+    lines = [messages["closed"].format(ticker=ticker, price=money(latest))]
+
+    if latest == metrics["high_52w"]:
+        lines.append(messages["at_high"])
+    else:
+        lines.append(messages["below_high"].format(diff=money(metrics["high_52w"] - latest), high=money(metrics["high_52w"])))
+
+    if latest == metrics["low_52w"]:
+        lines.append(messages["at_low"])
+    else:
+        lines.append(messages["above_low"].format(diff=money(latest - metrics["low_52w"]), low=money(metrics["low_52w"])))
+
+    for period in ("week", "month", "year"):
+        reference = metrics[f"one_{period}_ago"]
+        if reference:
+            direction = "above" if latest - reference > 0 else "below"
+            lines.append(messages[f"{period}_{direction}"].format(diff=money(abs(latest - reference)), ref=money(reference)))
+
+    for window in (5, 10, 30):
+        moving_average = metrics[f"ma_{window}"]
+        direction = "above" if latest > moving_average else "below"
+        lines.append(messages[f"ma{window}_{direction}"].format(ma=money(moving_average)))
+
+    return " ".join(lines)
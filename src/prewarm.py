@@ -0,0 +1,113 @@
+# Pre-warms the fragment cache for the most requested tickers after the market close.
+# Usage: python prewarm.py          (scheduler: runs every weekday at prewarm.run_at)
+#        python prewarm.py --once   (single pass now)
+import time
+import argparse
+from datetime import datetime, timedelta
+from utils import load_config
+from usage import top_requests
+import fragments
+from fragments import get_report_fragments, get_page_strings, next_snapshot
+from llama_functions import report_budget
+
+paths = load_config()
+settings = paths["prewarm"]
+
+
+def prewarm(top_n=None, history_days=None, time_budget_minutes=None, max_fragments=None, snapshot=None):
+    """
+    Builds the fragments of the most requested (ticker, language, mode) combinations.
+
+    Stops at whichever comes first: the list runs out, the time budget is spent or
+    max_fragments fragments were built. Combinations already cached cost nothing.
+
+    Args:
+        top_n (int): Number of combinations to consider.
+        history_days (int): Usage window used to rank them.
+        time_budget_minutes (float): Wall-clock budget for the pass.
+        max_fragments (int): Maximum number of fragments to build.
+        snapshot (str): Snapshot to warm (defaults to the next weekday).
+
+    Returns:
+        dict: Counts of built, already cached and skipped combinations, and LLM tokens spent.
+    """
+    top_n = top_n or settings.get("top_n", 40)
+    history_days = history_days or settings.get("history_days", 30)
+    time_budget = 60 * (time_budget_minutes or settings.get("time_budget_minutes", 20))
+    max_fragments = max_fragments or settings.get("max_fragments", 60)
+    snapshot = snapshot or next_snapshot()
+
+    started = time.monotonic()
+    stats = {"built": 0, "cached": 0, "skipped": 0}
+    warmed_pages = set()
+
+    requests = top_requests(top_n, history_days)
+    print(f"🔥 Pre-warming {len(requests)} combinations for snapshot {snapshot}")
+
+    # accounting only: the pass is bounded by its own time and fragment budgets
+    with report_budget(budget=None) as ledger:
+        for position, (ticker, language, mode, count) in enumerate(requests):
+            out_of_time = time.monotonic() - started > time_budget
+            if out_of_time or stats["built"] >= max_fragments:
+                stats["skipped"] = len(requests) - position
+                reason = "time budget" if out_of_time else "fragment quota"
+                print(f"⚠️ Pre-warm stopped by the {reason}; {stats['skipped']} combinations left cold.")
+                break
+
+            if (language, mode) not in warmed_pages:
+                get_page_strings(language, snapshot=snapshot, mode=mode)
+                warmed_pages.add((language, mode))
+
+            cache = fragments.fragment_cache
+            if cache.get(cache.key(ticker, language, snapshot, mode)) is not None:
+                stats["cached"] += 1
+                continue
+
+            get_report_fragments([ticker], language, snapshot=snapshot, mode=mode)
+            stats["built"] += 1
+            print(f"✅ Pre-warmed {ticker} ({language}, {mode}), requested {count} times")
+
+    stats["llm_tokens"] = ledger.total_tokens
+
+    elapsed = time.monotonic() - started
+    print(f"🔥 Pre-warm done in {elapsed:.1f}s: {stats}")
+    return stats
+
+
+def next_run(now, run_at):
+    """Returns the next weekday datetime at run_at ("HH:MM") strictly after now."""
+    hour, minute = (int(part) for part in run_at.split(":"))
+    candidate = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def run_scheduler(**budget):
+    """Runs a pre-warm pass (with the given prewarm() overrides) every weekday at prewarm.run_at."""
+    run_at = settings.get("run_at", "18:30")
+    while True:
+        scheduled = next_run(datetime.now(), run_at)
+        print(f"⏰ Next pre-warm at {scheduled:%Y-%m-%d %H:%M}")
+        time.sleep(max(0, (scheduled - datetime.now()).total_seconds()))
+        try:
+            prewarm(**budget)
+        except Exception as e:
+            print(f"❌ Pre-warm failed: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-warm report fragments for popular tickers.")
+    parser.add_argument("--once", action="store_true", help="run a single pass now and exit")
+    parser.add_argument("--top-n", type=int)
+    parser.add_argument("--time-budget-minutes", type=float)
+    parser.add_argument("--max-fragments", type=int)
+    args = parser.parse_args()
+
+    budget = {"top_n": args.top_n, "time_budget_minutes": args.time_budget_minutes, "max_fragments": args.max_fragments}
+    if args.once:
+        prewarm(**budget)
+    else:
+        run_scheduler(**budget)
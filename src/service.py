@@ -0,0 +1,151 @@
+# HTTP front end for the report generator (run: uvicorn service:app --port 8000)
+import os
+import re
+import math
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from utils import load_config, LANGUAGE_OPTIONS, LOCALIZATION_MODES
+from analysis import analyze_multiple_tickers
+from generate_pdf import get_report_fragments, CustomPDF
+from usage import record_request
+from llama_functions import report_budget
+
+paths = load_config()
+
+CHUNK_SIZE = 64 * 1024
+MAX_TICKERS = 20
+# Yahoo symbols (AAPL, ABEV3.SA, BRK-B, EURUSD=X, ^BVSP); anything else could break headers or cache keys
+TICKER_PATTERN = re.compile(r"^[A-Z0-9.\-=^]{1,15}$")
+
+
+class ReportRequest(BaseModel):
+    tickers: list[str]
+    language: str = "english"
+    mode: str = "llm"
+
+
+def build_report_bytes(tickers, language, mode="llm"):
+    """
+    Fetches data for the tickers and builds the PDF (runs in a worker).
+
+    Returns:
+        tuple: (PDF bytes, LLM token usage summary of the report).
+    """
+    with report_budget() as ledger:
+        fragments = get_report_fragments(tickers, language, mode=mode)
+        pdf = CustomPDF(paths, fragments, language, mode=mode)
+        pdf.build_report()
+    return pdf.to_bytes(), ledger.summary()
+
+
+def _json_value(value):
+    """Replaces NaN/inf (which yfinance sometimes returns) with None so the response is valid JSON."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def collect_metrics(tickers, language):
+    """Returns the raw, JSON-serializable metrics for the tickers (runs in a worker)."""
+    ticker_data = analyze_multiple_tickers(tickers, language, plot=False)
+
+    metrics = {}
+    for ticker, data in ticker_data.items():
+        prices = data["Stock Prices"]
+        metrics[ticker] = {
+            "description": data["Description"],
+            "financial_ratios": {k: _json_value(v) for k, v in data["Financial Ratios"].items()},
+            "prices": [
+                {"date": index.strftime("%Y-%m-%d"), "close": float(close)}
+                for index, close in prices["Close"].items()
+            ] if not prices.empty else [],
+        }
+    return metrics
+
+
+def _validate(request):
+    """Normalizes and checks the tickers, language and mode, raising HTTP 422 on bad input."""
+    tickers = list(dict.fromkeys(t.strip().upper() for t in request.tickers if t.strip()))
+    if not tickers:
+        raise HTTPException(status_code=422, detail="At least one ticker is required.")
+    if len(tickers) > MAX_TICKERS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_TICKERS} tickers per report.")
+    invalid = [t for t in tickers if not TICKER_PATTERN.match(t)]
+    if invalid:
+        raise HTTPException(status_code=422, detail=f"Invalid ticker(s): {invalid}")
+    if request.language not in LANGUAGE_OPTIONS.values():
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown language '{request.language}'. Options: {sorted(LANGUAGE_OPTIONS.values())}",
+        )
+    if request.mode not in LOCALIZATION_MODES.values():
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown mode '{request.mode}'. Options: {sorted(LOCALIZATION_MODES.values())}",
+        )
+    return tickers
+
+
+def create_app(workers=None, initializer=None):
+    """
+    Builds the ASGI app. Generation runs on a process pool so matplotlib and
+    fpdf never share state between concurrent requests.
+
+    Args:
+        workers (int): Pool size (defaults to REPORT_WORKERS or the CPU count).
+        initializer (callable): Optional function run once in each worker
+                                (the load test uses it to install local stand-ins).
+    """
+    workers = workers or int(os.environ.get("REPORT_WORKERS", os.cpu_count() or 1))
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=initializer)
+
+    app = FastAPI(title="p03-web-report")
+
+    @app.on_event("shutdown")
+    def shutdown_pool():
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run_in_pool(func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, func, *args)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "workers": workers}
+
+    @app.post("/report")
+    async def report(request: ReportRequest):
+        tickers = _validate(request)
+        # feeds prewarm.py; SQLite blocks, so keep it off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, record_request, tickers, request.language, request.mode)
+        pdf_bytes, llm_usage = await run_in_pool(build_report_bytes, tickers, request.language, request.mode)
+
+        def chunks():
+            for start in range(0, len(pdf_bytes), CHUNK_SIZE):
+                yield pdf_bytes[start:start + CHUNK_SIZE]
+
+        filename = f"financial_report_{'_'.join(tickers)}_{request.language}_{request.mode}.pdf"
+        return StreamingResponse(
+            chunks(),
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "Content-Length": str(len(pdf_bytes)),
+                "X-LLM-Prompt-Tokens": str(llm_usage["prompt_tokens"]),
+                "X-LLM-Completion-Tokens": str(llm_usage["completion_tokens"]),
+                "X-LLM-Latency": str(llm_usage["latency"]),
+            },
+        )
+
+    @app.post("/metrics")
+    async def metrics(request: ReportRequest):
+        tickers = _validate(request)
+        return await run_in_pool(collect_metrics, tickers, request.language)
+
+    return app
+
+
+app = create_app()
@@ -3,8 +3,10 @@ import streamlit as st
 import pandas as pd
 import datetime
 import os
-from utils import load_config
-from generate_pdf import analyze_multiple_tickers, CustomPDF  # Importing PDF generation functions
+from utils import load_config, LANGUAGE_OPTIONS, LOCALIZATION_MODES
+from generate_pdf import get_report_fragments, CustomPDF  # Importing PDF generation functions
+from usage import record_request
+from llama_functions import report_budget
 
 paths = load_config()
 
@@ -20,15 +22,6 @@ def load_tickers():
 
 TICKER_LIST = load_tickers()
 
-LANGUAGE_OPTIONS = {
-    "English": "english",
-    "Português (Brasil)": "pt",
-    "Español": "spanish",
-    "Français": "french",
-    "Deutsch": "de",
-    "Italiano": "italian"
-}
-
 # initial setup
 st.set_page_config(page_title="Company Comparison Report", layout="wide")
 st.title("📊 Company Comparison Report")
@@ -63,6 +56,14 @@ selected_language = st.selectbox(
     index=0  # Default to English
 )
 
+selected_mode = st.radio(
+    "⚡ Text Generation",
+    options=list(LOCALIZATION_MODES.keys()),
+    index=0,  # Default to LLM-polished
+    horizontal=True,
+    help="Fast mode fills built-in translations from the computed numbers, without calling the LLM."
+)
+
 ### 3. Display Selections
 st.write("### Selected Parameters:")
 st.write(f"**📌 Companies:** {', '.join(selected_tickers) if selected_tickers else 'None selected'}")
@@ -74,9 +75,18 @@ if selected_tickers and selected_language:
         st.success("✅ Report is being generated... Please wait.")
 
         # Call PDF generation
-        ticker_data = analyze_multiple_tickers(selected_tickers, language=LANGUAGE_OPTIONS[selected_language])
-        pdf = CustomPDF(paths, ticker_data, language=LANGUAGE_OPTIONS[selected_language])
-        pdf.generate_report()
+        mode = LOCALIZATION_MODES[selected_mode]
+        record_request(selected_tickers, LANGUAGE_OPTIONS[selected_language], mode)  # feeds prewarm.py
+        with report_budget() as ledger:
+            fragments = get_report_fragments(selected_tickers, language=LANGUAGE_OPTIONS[selected_language], mode=mode)
+            pdf = CustomPDF(paths, fragments, language=LANGUAGE_OPTIONS[selected_language], mode=mode)
+            pdf.generate_report()
+
+        llm_usage = ledger.summary()
+        st.caption(
+            f"LLM: {llm_usage['calls']} calls, {llm_usage['prompt_tokens']} prompt + "
+            f"{llm_usage['completion_tokens']} completion tokens, {llm_usage['latency']:.1f}s"
+        )
 
         today_date = datetime.datetime.now().strftime("%Y_%m_%d")  # Format: YYYY_MM_DD
         pdf_filename = f"financial_report_{today_date}.pdf"  # Define a name for the report
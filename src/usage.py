@@ -0,0 +1,69 @@
+import os
+import sqlite3
+from datetime import date, timedelta
+from utils import load_config
+
+paths = load_config()
+
+
+def _connect(db_path=None):
+    db_path = db_path or paths["usage_db"]
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    connection = sqlite3.connect(db_path, timeout=10)
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS usage (
+            day TEXT NOT NULL,
+            ticker TEXT NOT NULL,
+            language TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, ticker, language, mode)
+        )
+        """
+    )
+    return connection
+
+
+def record_request(tickers, language, mode="llm", db_path=None):
+    """
+    Counts one report request for each (ticker, language, mode) combination.
+
+    Usage tracking must never break report generation, so errors are only logged.
+    """
+    today = date.today().isoformat()
+    try:
+        with _connect(db_path) as connection:
+            connection.executemany(
+                """
+                INSERT INTO usage (day, ticker, language, mode, count) VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT (day, ticker, language, mode) DO UPDATE SET count = count + 1
+                """,
+                [(today, ticker.upper(), language, mode) for ticker in dict.fromkeys(tickers)],
+            )
+        connection.close()
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠️ Could not record usage: {e}")
+
+
+def top_requests(n, history_days=30, db_path=None):
+    """
+    Returns the n most requested combinations over the last history_days days.
+
+    Returns:
+        list: (ticker, language, mode, count) tuples, most requested first.
+    """
+    since = (date.today() - timedelta(days=history_days)).isoformat()
+    with _connect(db_path) as connection:
+        rows = connection.execute(
+            """
+            SELECT ticker, language, mode, SUM(count) AS total FROM usage
+            WHERE day >= ?
+            GROUP BY ticker, language, mode
+            ORDER BY total DESC, ticker
+            LIMIT ?
+            """,
+            (since, n),
+        ).fetchall()
+    connection.close()
+    return rows
@@ -1,6 +1,22 @@
 import os
 import yaml
 
+# Display name -> language passed to the translation functions
+LANGUAGE_OPTIONS = {
+    "English": "english",
+    "Português (Brasil)": "pt",
+    "Español": "spanish",
+    "Français": "french",
+    "Deutsch": "de",
+    "Italiano": "italian"
+}
+
+# Display name -> localization mode ("fast" fills message catalogs, "llm" asks LLaMA)
+LOCALIZATION_MODES = {
+    "LLM-polished": "llm",
+    "Fast (no LLM)": "fast"
+}
+
 def load_config():
     """Load configuration from config.yaml."""
     script_dir = os.path.dirname(os.path.abspath(__file__))  
@@ -20,7 +36,11 @@ def load_config():
         "header_image": os.path.join(script_dir, config["paths"]["images"], "header.png"),
         "fonts": os.path.join(script_dir, config["paths"]["fonts"]), 
         "groq": config["api_keys"]["groq"],
-        "data_processed": os.path.join(script_dir, config["paths"]["data_processed"])
+        "data_processed": os.path.join(script_dir, config["paths"]["data_processed"]),
+        "fragments": os.path.join(script_dir, config["paths"]["fragments"]),
+        "usage_db": os.path.join(script_dir, config["paths"]["usage_db"]),
+        "prewarm": config.get("prewarm", {}),
+        "llm": config.get("llm", {})
     }
 
     # Ensure directories exist